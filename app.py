@@ -3,18 +3,56 @@ Student Performance Tracker - Flask Web Application
 Main application file with routes and web interface.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file
+from flask import Flask, Response, render_template, request, redirect, url_for, flash, send_file, jsonify, g
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
 import database as db
-from datetime import datetime
+from cache import LRUCache
+import reports
+from datetime import datetime, timedelta
+import click
 import os
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-in-production'  # Change this in production
 
+# Persist compiled templates so new workers skip recompiling them on boot
+JINJA_CACHE_DIR = os.environ.get('JINJA_CACHE_DIR', '/tmp/jinja_cache' if os.environ.get('VERCEL') else '.jinja_cache')
+os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+
+# Rendered student table rows, keyed by (student id, grade version)
+student_row_cache = LRUCache(max_size=int(os.environ.get('STUDENT_ROW_CACHE_SIZE', 20000)))
+
+# Largest number of roll numbers accepted by /api/students/lookup
+MAX_BULK_LOOKUP = int(os.environ.get('MAX_BULK_LOOKUP', 10000))
+
+# Grade distributions, keyed by (subject or None, bucket width, data version)
+distribution_cache = LRUCache(max_size=256)
+
 # Initialize database
 db.init_database()
 
 
+@app.before_request
+def open_read_session():
+    """
+    Serve all reads of a GET/HEAD request from one connection and one
+    read transaction, so the page sees a single snapshot of the data.
+    Other methods write, and their reads should see those writes.
+    """
+    if request.method in ('GET', 'HEAD'):
+        g.read_session = db.begin_read_session()
+
+
+@app.teardown_request
+def close_read_session(exc):
+    """End the request's read session, if one was opened."""
+    token = g.pop('read_session', None)
+    if token is not None:
+        db.end_read_session(token)
+
+
 @app.route('/')
 def index():
     """Home page with dashboard."""
@@ -37,11 +75,30 @@ def index():
                          recent_students=students[:5])
 
 
+def render_student_row(student):
+    """
+    Render a student's table row, reusing the cached fragment when the
+    student's grades have not changed since it was rendered.
+    
+    Args:
+        student (dict): Student data from get_all_students_with_grades
+        
+    Returns:
+        Markup: Rendered <tr> fragment
+    """
+    key = (student['id'], student['grade_version'])
+    return student_row_cache.get_or_create(
+        key, lambda: Markup(render_template('student_row.html', student=student))
+    )
+
+
 @app.route('/students')
 def students_list():
     """Display list of all students."""
     students = db.get_all_students_with_grades()
-    return render_template('students_list.html', students=students)
+    students.sort(key=lambda s: s['name'].lower())
+    student_rows = [render_student_row(student) for student in students]
+    return render_template('students_list.html', students=students, student_rows=student_rows)
 
 
 @app.route('/add_student', methods=['GET', 'POST'])
@@ -134,6 +191,51 @@ def view_student(roll_number):
     return render_template('view_student.html', student=student)
 
 
+@app.route('/api/students/lookup', methods=['POST'])
+def students_lookup_json():
+    """
+    Look up many students by roll number in one request.
+    
+    Expects a JSON body {"roll_numbers": [...]} and returns
+    {"found": {roll_number: student}, "missing": [roll_number, ...]}.
+    """
+    payload = request.get_json(silent=True)
+    roll_numbers = payload.get('roll_numbers') if isinstance(payload, dict) else None
+    
+    if not isinstance(roll_numbers, list) or not all(isinstance(r, str) for r in roll_numbers):
+        return jsonify({'error': 'roll_numbers must be a list of strings'}), 400
+    
+    if len(roll_numbers) > MAX_BULK_LOOKUP:
+        return jsonify({'error': f'At most {MAX_BULK_LOOKUP} roll numbers per request'}), 400
+    
+    found, missing = db.get_students_with_grades_bulk(roll_numbers)
+    return jsonify({'found': found, 'missing': missing})
+
+
+@app.route('/api/students/<roll_number>/trend')
+def student_trend_json(roll_number):
+    """Return a student's grade history as JSON (optional subject/since/until)."""
+    student = db.get_student_by_roll_number(roll_number)
+    
+    if not student:
+        return jsonify({'error': 'Student not found'}), 404
+    
+    trend = db.get_student_trend(student['id'],
+                                 subject=request.args.get('subject'),
+                                 since=request.args.get('since'),
+                                 until=request.args.get('until'))
+    return jsonify({'roll_number': roll_number, 'trend': trend})
+
+
+@app.route('/api/subjects/<subject>/monthly')
+def subject_monthly_json(subject):
+    """Return a subject's average grade per month as JSON (optional since/until)."""
+    months = db.get_subject_monthly_averages(subject,
+                                             since=request.args.get('since'),
+                                             until=request.args.get('until'))
+    return jsonify({'subject': subject, 'months': months})
+
+
 @app.route('/subject_topper')
 def subject_topper_form():
     """Display form to select subject for topper."""
@@ -162,14 +264,79 @@ def class_average_form():
 
 @app.route('/class_average/<subject>')
 def class_average(subject):
-    """Display class average for a subject."""
+    """Display class average and grade distribution for a subject."""
     subjects = db.get_all_subjects()
     average = db.get_class_average(subject)
+    distribution = get_cached_distribution(subject, get_bucket_width())
     
     if average is None:
         flash(f'No grades found for subject: {subject}', 'warning')
     
-    return render_template('class_average.html', subjects=subjects, average=average, selected_subject=subject)
+    return render_template('class_average.html', subjects=subjects, average=average,
+                           distribution=distribution, selected_subject=subject)
+
+
+def get_bucket_width():
+    """Read the whole-number histogram bucket width from the query string (default 10)."""
+    bucket_width = request.args.get('bucket_width', 10, type=int)
+    return bucket_width if 0 < bucket_width <= 100 else 10
+
+
+def get_cached_distribution(subject, bucket_width):
+    """
+    Get a subject's grade distribution, or all subjects' when subject is
+    None, reusing the cached result until the data changes.
+    """
+    key = (subject, bucket_width, db.get_data_version())
+    if subject is None:
+        return distribution_cache.get_or_create(key, lambda: db.get_subject_summary(bucket_width))
+    return distribution_cache.get_or_create(key, lambda: db.get_subject_distribution(subject, bucket_width))
+
+
+@app.route('/api/subjects/summary')
+def subject_summary_json():
+    """Return grade distributions for every subject as JSON."""
+    return jsonify(get_cached_distribution(None, get_bucket_width()))
+
+
+@app.route('/api/subjects/<subject>/distribution')
+def subject_distribution_json(subject):
+    """Return the grade distribution for a subject as JSON."""
+    distribution = get_cached_distribution(subject, get_bucket_width())
+    
+    if distribution is None:
+        return jsonify({'error': f'No grades found for subject: {subject}'}), 404
+    
+    return jsonify(distribution)
+
+
+@app.route('/subject_weights', methods=['GET', 'POST'])
+def subject_weights():
+    """View and update the credit weight of each subject."""
+    if request.method == 'POST':
+        errors = []
+        
+        for key in request.form:
+            if key.startswith('subject_'):
+                index = key.split('_')[1]
+                subject = request.form[key]
+                weight = request.form.get(f'weight_{index}', '').strip()
+                
+                success, message = db.set_subject_weight(subject, weight)
+                if not success:
+                    errors.append(f"{subject}: {message}")
+        
+        if errors:
+            for error in errors:
+                flash(error, 'error')
+        else:
+            flash('Subject weights updated successfully', 'success')
+        
+        return redirect(url_for('subject_weights'))
+    
+    return render_template('subject_weights.html',
+                           subjects=db.get_all_subjects(),
+                           weights=db.get_subject_weights())
 
 
 @app.route('/export')
@@ -216,7 +383,28 @@ def export_data():
                 f.write("\n" + "=" * 80 + "\n\n")
     
     flash(f'Data exported successfully to {filename}', 'success')
-    return send_file(filepath, as_attachment=True)
+    return send_file(os.path.abspath(filepath), as_attachment=True)
+
+
+@app.route('/export/report_cards')
+def export_report_cards():
+    """Stream a ZIP with one report card per student."""
+    students = db.get_report_card_data()
+    # Render in-process by default; forking a pool from a threaded server per
+    # request is costly, so use `python reports.py` for large offline runs
+    workers = int(os.environ.get('REPORT_WORKERS', 1))
+    step = max(1, len(students) // 10)
+    
+    def log_progress(done, total):
+        if done % step == 0 or done == total:
+            app.logger.info('Report cards: %d/%d generated', done, total)
+    
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return Response(
+        reports.iter_report_zip(students, workers, log_progress),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename=report_cards_{timestamp}.zip'}
+    )
 
 
 @app.route('/delete_student/<roll_number>', methods=['POST'])
@@ -232,6 +420,19 @@ def delete_student(roll_number):
     return redirect(url_for('students_list'))
 
 
+@app.cli.command('compact-grade-events')
+@click.option('--older-than', default=365, show_default=True,
+              help='Compact grade events older than this many days.')
+def compact_grade_events_command(older_than):
+    """Roll old grade events into monthly summaries."""
+    before = (datetime.utcnow() - timedelta(days=older_than)).strftime('%Y-%m-%d')
+    success, message = db.compact_grade_events(before)
+    click.echo(message)
+    
+    if not success:
+        raise SystemExit(1)
+
+
 @app.errorhandler(404)
 def page_not_found(e):
     """Handle 404 errors."""
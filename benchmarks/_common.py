@@ -0,0 +1,68 @@
+"""
+Student Performance Tracker - Benchmark Helpers
+Setup shared by the benchmark scripts: a throwaway database, bulk seeding
+and timing.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBJECTS = ['Math', 'Science', 'English', 'History', 'Art', 'Physics']
+
+
+def use_throwaway_database(prefix='spt_bench_'):
+    """
+    Point the app at a new temporary directory and make it importable.
+
+    Must be called before database or app is imported, as the database
+    location is read at import time.
+
+    Returns:
+        str: The temporary directory holding the database and caches
+    """
+    workdir = tempfile.mkdtemp(prefix=prefix)
+    os.environ['DATABASE_DIR'] = workdir
+    os.environ.setdefault('JINJA_CACHE_DIR', os.path.join(workdir, 'jinja_cache'))
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return workdir
+
+
+def seed(count, digits=5):
+    """
+    Insert count students with four random grades each in bulk.
+
+    Args:
+        count (int): Number of students
+        digits (int): Zero-padded width of the number in names and roll numbers
+
+    Returns:
+        list: Roll numbers inserted, 'R' followed by the student's index
+    """
+    import database as db
+
+    rng = random.Random(42)
+    roll_numbers = [f'R{i:0{digits}d}' for i in range(count)]
+    with db.get_db_connection() as conn:
+        conn.executemany(
+            'INSERT INTO students (name, roll_number) VALUES (?, ?)',
+            [(f'Student {i:0{digits}d}', roll) for i, roll in enumerate(roll_numbers)]
+        )
+        ids = [row['id'] for row in conn.execute('SELECT id FROM students')]
+        conn.executemany(
+            'INSERT INTO grades (student_id, subject, grade) VALUES (?, ?, ?)',
+            [(sid, subject, rng.randint(30, 100))
+             for sid in ids for subject in rng.sample(SUBJECTS, 4)]
+        )
+    return roll_numbers
+
+
+def timed(func):
+    """Run func and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
@@ -0,0 +1,48 @@
+"""
+Student Performance Tracker - Report Card Benchmark
+Measures report card ZIP generation throughput, in reports per second and
+reports per second per worker core, for a range of worker counts.
+
+Usage:
+    python benchmarks/bench_report_cards.py [--students 10000] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import time
+
+from _common import seed, use_throwaway_database
+
+# Point the app at a throwaway database before it is imported
+use_throwaway_database()
+
+import database as db  # noqa: E402
+import reports  # noqa: E402
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, cpus}))
+    args = parser.parse_args()
+
+    seed(args.students)
+
+    start = time.perf_counter()
+    students = db.get_report_card_data()
+    print(f"prefetch: {(time.perf_counter() - start) * 1000:.1f} ms for {len(students)} students")
+
+    for workers in args.workers:
+        size = 0
+        start = time.perf_counter()
+        for chunk in reports.iter_report_zip(students, workers):
+            size += len(chunk)
+        elapsed = time.perf_counter() - start
+        rate = len(students) / elapsed
+        print(f"workers={workers:<3} {elapsed:7.2f} s  {rate:9.0f} reports/s  "
+              f"{rate / workers:9.0f} reports/s/core  zip={size / 1024:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
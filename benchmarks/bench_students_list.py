@@ -0,0 +1,55 @@
+"""
+Student Performance Tracker - Students List Benchmark
+Measures data loading and template rendering for /students separately,
+with a cold and a warm row-fragment cache.
+
+Usage:
+    python benchmarks/bench_students_list.py [--students 10000]
+"""
+
+import argparse
+
+from _common import seed, timed, use_throwaway_database
+
+# Point the app at a throwaway database before it is imported
+use_throwaway_database()
+
+import database as db  # noqa: E402
+from app import app, render_student_row, student_row_cache  # noqa: E402
+from flask import render_template  # noqa: E402
+
+def render_page(students):
+    """Render the full students page from already-loaded data."""
+    rows = [render_student_row(student) for student in students]
+    return render_template('students_list.html', students=students, student_rows=rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--students', type=int, default=10000)
+    args = parser.parse_args()
+
+    seed(args.students)
+
+    with app.test_request_context('/students'):
+        students, load_time = timed(db.get_all_students_with_grades)
+        students.sort(key=lambda s: s['name'].lower())
+
+        student_row_cache.clear()
+        _, cold_time = timed(lambda: render_page(students))
+        _, warm_time = timed(lambda: render_page(students))
+
+        # Touch 1% of students to model a typical edit between page views
+        for student in students[::100]:
+            student['grade_version'] += 1
+        _, partial_time = timed(lambda: render_page(students))
+
+    print(f"students:                {args.students}")
+    print(f"data load:               {load_time * 1000:8.1f} ms")
+    print(f"render (cold cache):     {cold_time * 1000:8.1f} ms")
+    print(f"render (warm cache):     {warm_time * 1000:8.1f} ms")
+    print(f"render (1% rows stale):  {partial_time * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
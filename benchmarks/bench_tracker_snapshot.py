@@ -0,0 +1,86 @@
+"""
+Student Performance Tracker - Tracker Snapshot Benchmark
+Compares rebuilding a StudentTracker from SQLite with opening a binary
+snapshot (StudentTracker.load), for opening, random lookups and full scans,
+and reports how much memory a scan leaves behind in the mapped tracker.
+
+Usage:
+    python benchmarks/bench_tracker_snapshot.py [--students 1000000] [--lookups 10000]
+"""
+
+import argparse
+import os
+import random
+import tracemalloc
+
+from _common import seed, timed, use_throwaway_database
+
+# Point the app at a throwaway database before it is imported
+use_throwaway_database()
+
+import database as db  # noqa: E402
+from models import StudentTracker  # noqa: E402
+
+def rebuild_from_sqlite():
+    """Replay every student and grade from SQLite into a new tracker."""
+    tracker = StudentTracker()
+    for student in db.get_all_students_with_grades():
+        tracker.add_student(student['name'], student['roll_number'])
+        tracker.add_grades(student['roll_number'], student['grades'])
+    return tracker
+
+
+def lookups(tracker, roll_numbers):
+    """Look up and average each roll number."""
+    for roll_number in roll_numbers:
+        tracker.calculate_average(roll_number)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--students', type=int, default=1000000)
+    parser.add_argument('--lookups', type=int, default=10000)
+    args = parser.parse_args()
+
+    _, seed_time = timed(lambda: seed(args.students, digits=7))
+    print(f"seeded {args.students} students into SQLite in {seed_time:.1f} s")
+
+    rng = random.Random(7)
+    sample = [f'R{rng.randrange(args.students):07d}' for _ in range(args.lookups)]
+    path = os.path.join(os.environ['DATABASE_DIR'], 'tracker.sptb')
+
+    tracker, rebuild_time = timed(rebuild_from_sqlite)
+    _, save_time = timed(lambda: tracker.save(path))
+    _, memory_lookup_time = timed(lambda: lookups(tracker, sample))
+    del tracker
+
+    loaded, load_time = timed(lambda: StudentTracker.load(path))
+    _, mapped_lookup_time = timed(lambda: lookups(loaded, sample))
+    _, scan_time = timed(lambda: loaded.get_class_average('Math'))
+    _, topper_time = timed(lambda: loaded.get_subject_topper('Math'))
+    _, subjects_time = timed(loaded.get_all_subjects)
+    
+    # Scans should build students on the fly, not keep them
+    fresh = StudentTracker.load(path)
+    tracemalloc.start()
+    fresh.get_class_average('Math')
+    scan_memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results = [
+        ('rebuild from SQLite', rebuild_time),
+        ('save snapshot', save_time),
+        ('load snapshot (mmap)', load_time),
+        (f'{args.lookups} lookups, rebuilt', memory_lookup_time),
+        (f'{args.lookups} lookups, mapped', mapped_lookup_time),
+        ('full scan (class average), mapped', scan_time),
+        ('full scan (subject topper), mapped', topper_time),
+        ('full scan (all subjects), mapped', subjects_time),
+    ]
+    print(f"{'snapshot size':<36}{os.path.getsize(path) / 2**20:10.1f} MiB")
+    for label, elapsed in results:
+        print(f"{label:<36}{elapsed * 1000:10.1f} ms")
+    print(f"{'memory kept after a scan':<36}{scan_memory / 2**20:10.1f} MiB")
+
+if __name__ == '__main__':
+    main()
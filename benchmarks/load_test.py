@@ -0,0 +1,291 @@
+"""
+Student Performance Tracker - Load Test
+Starts the app on localhost, either in-process on Werkzeug's threaded WSGI
+server or under gunicorn with N workers, drives a weighted mix of requests
+from many threads, and prints throughput, p50/p95/p99 latency and error
+rates as JSON.
+
+Usage:
+    python benchmarks/load_test.py [--server wsgi|gunicorn] [--workers 4]
+                                   [--concurrency 16] [--duration 10]
+                                   [--students 1000] [--scenario FILE]
+    python benchmarks/load_test.py --url http://host:port  # existing server
+
+A scenario file is JSON with optional "students" and a list of "phases",
+each with "name", "duration" (seconds), "concurrency" and a "mix" of
+endpoint weights, e.g. benchmarks/scenarios/exam_week.json.
+
+A request counts as an error when it fails, returns a 4xx/5xx status, or
+flashes an error message (how /add_grades reports failed writes).
+"""
+
+import argparse
+import base64
+import http.client
+import json
+import logging
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import urlencode, urlsplit
+
+from _common import REPO_ROOT, SUBJECTS, use_throwaway_database
+from _common import seed as seed_database
+
+DEFAULT_MIX = {'index': 10, 'students': 20, 'view_student': 45, 'add_grades': 20, 'export': 5}
+
+
+def build_request(endpoint, rng, roll_numbers):
+    """
+    Build the HTTP request for one endpoint of the mix.
+
+    Returns:
+        tuple: (method, path, body, headers)
+    """
+    if endpoint == 'index':
+        return 'GET', '/', None, {}
+    if endpoint == 'students':
+        return 'GET', '/students', None, {}
+    if endpoint == 'view_student':
+        return 'GET', f'/view_student/{rng.choice(roll_numbers)}', None, {}
+    if endpoint == 'add_grades':
+        body = urlencode({'subject_0': rng.choice(SUBJECTS), 'grade_0': rng.randint(30, 100)})
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        return 'POST', f'/add_grades/{rng.choice(roll_numbers)}', body, headers
+    if endpoint == 'export':
+        return 'GET', '/export', None, {}
+    raise ValueError(f"Unknown endpoint in mix: {endpoint}")
+
+
+def flashed_categories(response):
+    """
+    Categories of the flash messages set by a response.
+
+    The app reports failures such as 'Database error: ...' as flashed
+    'error' messages on an otherwise successful redirect. Flashes travel
+    in Flask's signed (not encrypted) session cookie, so they can be read
+    here without the secret key.
+
+    Returns:
+        list: Flash categories, e.g. ['success'] or ['error']
+    """
+    for name, value in response.getheaders():
+        if name.lower() != 'set-cookie' or not value.startswith('session='):
+            continue
+        payload = value.split(';', 1)[0][len('session='):]
+        compressed = payload.startswith('.')
+        data = payload.lstrip('.').split('.', 1)[0]
+        raw = base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+        if compressed:
+            raw = zlib.decompress(raw)
+        flashes = json.loads(raw).get('_flashes', [])
+        return [flash[' t'][0] for flash in flashes if ' t' in flash]
+    return []
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    """
+    Summarize (latency seconds, ok) samples.
+
+    Returns:
+        dict: requests, errors, error_rate, throughput_rps and p50/p95/p99 in ms
+    """
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    result = {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': round(errors / len(samples), 4) if samples else 0,
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0,
+    }
+    for name, fraction in [('p50_ms', 0.50), ('p95_ms', 0.95), ('p99_ms', 0.99)]:
+        value = percentile(latencies, fraction)
+        result[name] = round(value * 1000, 2) if value is not None else None
+    return result
+
+
+def run_phase(base_url, phase, roll_numbers, seed=0):
+    """
+    Drive one phase of load and return its summary.
+
+    Args:
+        base_url (str): Server URL, e.g. http://127.0.0.1:8000
+        phase (dict): name, duration, concurrency and mix
+        roll_numbers (list): Roll numbers that exist in the database
+        seed (int): Random seed for reproducible request sequences
+    """
+    target = urlsplit(base_url)
+    mix = phase.get('mix', DEFAULT_MIX)
+    endpoints = list(mix)
+    weights = [mix[name] for name in endpoints]
+    samples = {name: [] for name in endpoints}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + phase['duration']
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        conn = http.client.HTTPConnection(target.hostname, target.port, timeout=30)
+        local = {name: [] for name in endpoints}
+        while time.perf_counter() < deadline:
+            endpoint = rng.choices(endpoints, weights)[0]
+            method, path, body, headers = build_request(endpoint, rng, roll_numbers)
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                # A redirect carrying an error flash is a failed request too
+                ok = response.status < 400 and 'error' not in flashed_categories(response)
+            except (OSError, http.client.HTTPException):
+                ok = False
+                conn.close()
+            local[endpoint].append((time.perf_counter() - start, ok))
+        conn.close()
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(phase['concurrency'])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    all_samples = [sample for values in samples.values() for sample in values]
+    return {
+        'name': phase.get('name', 'load'),
+        'duration_s': round(elapsed, 2),
+        'concurrency': phase['concurrency'],
+        'overall': summarize(all_samples, elapsed),
+        'endpoints': {name: summarize(values, elapsed) for name, values in samples.items()},
+    }
+
+
+def free_port():
+    """Find an unused localhost port."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    """Block until something accepts connections on localhost:port."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start on port {port} within {timeout}s")
+
+
+def start_wsgi_server(port):
+    """Serve the app in-process on Werkzeug's threaded server."""
+    from werkzeug.serving import make_server
+    from app import app
+
+    # Per-request access logs would drown out the report
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server.shutdown
+
+
+def start_gunicorn(port, workers, workdir):
+    """Serve the app under gunicorn with the given number of workers."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--workers', str(workers),
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'app:app'],
+        cwd=workdir, env=env
+    )
+
+    def stop():
+        process.terminate()
+        process.wait(timeout=30)
+
+    return stop
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--server', choices=['wsgi', 'gunicorn'], default='wsgi')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='gunicorn worker processes')
+    parser.add_argument('--url', help='Load an already running server instead of starting one '
+                                      '(its database must contain roll numbers R00000...)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--scenario', help='JSON scenario file with phases')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+
+    scenario = {}
+    if args.scenario:
+        with open(args.scenario, encoding='utf-8') as f:
+            scenario = json.load(f)
+    students = scenario.get('students', args.students)
+    phases = scenario.get('phases') or [
+        {'name': 'load', 'duration': args.duration, 'concurrency': args.concurrency, 'mix': DEFAULT_MIX}
+    ]
+
+    stop = None
+    if args.url:
+        base_url = args.url
+        roll_numbers = [f'R{i:05d}' for i in range(students)]
+    else:
+        # Run against a throwaway database, with exports and caches kept out of the repo
+        workdir = use_throwaway_database(prefix='spt_load_')
+        os.chdir(workdir)
+
+        roll_numbers = seed_database(students)
+        port = free_port()
+        if args.server == 'gunicorn':
+            stop = start_gunicorn(port, args.workers, workdir)
+        else:
+            stop = start_wsgi_server(port)
+        wait_for_port(port)
+        base_url = f'http://127.0.0.1:{port}'
+
+    try:
+        results = [run_phase(base_url, phase, roll_numbers, seed=i) for i, phase in enumerate(phases)]
+    finally:
+        if stop:
+            stop()
+
+    report = {
+        'server': 'external' if args.url else args.server,
+        'workers': args.workers if args.server == 'gunicorn' and not args.url else None,
+        'students': students,
+        'phases': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
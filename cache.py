@@ -0,0 +1,81 @@
+"""
+Student Performance Tracker - Caching Helpers
+This module provides small in-process caches used by the web layer.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """A thread-safe, size-bounded least-recently-used cache."""
+
+    def __init__(self, max_size=1000):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): Maximum number of entries kept before the
+                least recently used one is evicted
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Look up a cached value and mark it as recently used.
+
+        Args:
+            key: Cache key (must be hashable)
+            default: Value returned when the key is not cached
+
+        Returns:
+            The cached value, or default if not present
+        """
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        """
+        Store a value, evicting the oldest entry if the cache is full.
+
+        Args:
+            key: Cache key (must be hashable)
+            value: Value to store
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """
+        Return the cached value for key, building it with factory on a miss.
+
+        Args:
+            key: Cache key (must be hashable)
+            factory (callable): Zero-argument function producing the value
+
+        Returns:
+            The cached or newly created value
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        """Number of entries currently cached."""
+        return len(self._entries)
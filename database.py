@@ -4,6 +4,8 @@ This module handles all database operations using SQLite.
 """
 
 import sqlite3
+import contextvars
+import math
 import os
 from contextlib import contextmanager
 
@@ -12,6 +14,24 @@ from contextlib import contextmanager
 DATABASE_DIR = os.environ.get('DATABASE_DIR', '/tmp' if os.environ.get('VERCEL') else '.')
 DATABASE_NAME = os.path.join(DATABASE_DIR, 'student_tracker.db')
 
+# Credit-weighted average over grades "g" joined to their weights "w";
+# subjects without a row in subject_weights count with weight 1
+_WEIGHTED_AVERAGE_EXPR = '''
+    ROUND(SUM(g.grade * COALESCE(w.weight, 1.0)) / SUM(COALESCE(w.weight, 1.0)), 2)
+'''
+_WEIGHTED_GRADES_FROM = '''
+    FROM grades g
+    LEFT JOIN subject_weights w ON w.subject = g.subject
+'''
+
+# The same average for one student, correlated to an outer "students" row;
+# used to keep students.average current
+_WEIGHTED_AVERAGE_SQL = f'''
+    SELECT COALESCE({_WEIGHTED_AVERAGE_EXPR}, 0)
+    {_WEIGHTED_GRADES_FROM}
+    WHERE g.student_id = students.id
+'''
+
 @contextmanager
 def get_db_connection():
     """
@@ -30,6 +50,93 @@ def get_db_connection():
         conn.close()
 
 
+# Read session active in the current context (request), if any
+_read_session = contextvars.ContextVar('read_session', default=None)
+
+
+class _ReadSession:
+    """A single connection holding one deferred read transaction."""
+    
+    def __init__(self):
+        self.conn = None
+    
+    def connection(self):
+        """Open the connection and start the transaction on first use."""
+        if self.conn is None:
+            self.conn = sqlite3.connect(DATABASE_NAME)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute('BEGIN DEFERRED')
+        return self.conn
+    
+    def close(self):
+        """End the read transaction and close the connection."""
+        if self.conn is not None:
+            self.conn.rollback()
+            self.conn.close()
+            self.conn = None
+
+
+def begin_read_session():
+    """
+    Start a read session for the current context.
+    
+    Until end_read_session is called, every read in this module shares one
+    connection and one read transaction, so they all see the same snapshot
+    of the database. Writes still use their own connections and commit
+    without waiting for the session (the database runs in WAL mode), but
+    are not visible to reads in a session that has already started.
+    
+    Returns:
+        Token to pass to end_read_session
+    """
+    return _read_session.set(_ReadSession())
+
+
+def end_read_session(token):
+    """
+    End the read session started by begin_read_session.
+    
+    Args:
+        token: Value returned by begin_read_session
+    """
+    session = _read_session.get()
+    _read_session.reset(token)
+    if session is not None:
+        session.close()
+
+
+@contextmanager
+def read_session():
+    """
+    Context manager for a read session (see begin_read_session).
+    Reuses the current session if one is already open.
+    """
+    if _read_session.get() is not None:
+        yield
+        return
+    
+    token = begin_read_session()
+    try:
+        yield
+    finally:
+        end_read_session(token)
+
+
+@contextmanager
+def get_read_connection():
+    """
+    Context manager for read-only queries.
+    Uses the current read session's connection if one is open, otherwise
+    a new connection like get_db_connection.
+    """
+    session = _read_session.get()
+    if session is None:
+        with get_db_connection() as conn:
+            yield conn
+    else:
+        yield session.connection()
+
+
 def init_database():
     """
     Initialize the database with required tables.
@@ -38,12 +145,23 @@ def init_database():
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
+        # Write-ahead logging lets read sessions keep their snapshot while
+        # other connections commit writes (the setting persists in the file)
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
+        # Take the write lock before inspecting the schema, so when several
+        # processes start at once (gunicorn workers) one finishes creating
+        # and migrating tables before the next checks what is missing
+        cursor.execute('BEGIN IMMEDIATE')
+        
         # Create students table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS students (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 roll_number TEXT UNIQUE NOT NULL,
+                grade_version INTEGER NOT NULL DEFAULT 0,
+                average REAL NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -60,10 +178,177 @@ def init_database():
                 UNIQUE(student_id, subject)
             )
         ''')
+        # Per-subject statistics (distributions, ranks, class averages)
+        # read one subject's grades in order from this index
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_grades_subject
+            ON grades (subject, grade)
+        ''')
+        
+        # Create grade events table: append-only history of every grade
+        # written; the grades table keeps only the current value
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'grade_events'"
+        )
+        has_grade_events = cursor.fetchone() is not None
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS grade_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                student_id INTEGER NOT NULL,
+                subject TEXT NOT NULL,
+                grade REAL NOT NULL CHECK(grade >= 0 AND grade <= 100),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (student_id) REFERENCES students (id) ON DELETE CASCADE
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_grade_events_student
+            ON grade_events (student_id, subject, created_at)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_grade_events_subject
+            ON grade_events (subject, created_at, grade)
+        ''')
+        if not has_grade_events:
+            # Start the history from the grades already recorded
+            cursor.execute('''
+                INSERT INTO grade_events (student_id, subject, grade, created_at)
+                SELECT student_id, subject, grade, created_at FROM grades
+            ''')
+        
+        # Create grade event summaries table: monthly roll-ups of grade
+        # events removed by compact_grade_events
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS grade_event_summaries (
+                student_id INTEGER NOT NULL,
+                subject TEXT NOT NULL,
+                period TEXT NOT NULL,
+                event_count INTEGER NOT NULL,
+                grade_sum REAL NOT NULL,
+                min_grade REAL NOT NULL,
+                max_grade REAL NOT NULL,
+                PRIMARY KEY (student_id, subject, period)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_grade_event_summaries_subject
+            ON grade_event_summaries (subject, period)
+        ''')
+        
+        # Create subject weights table (credit weight per subject)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS subject_weights (
+                subject TEXT PRIMARY KEY,
+                weight REAL NOT NULL CHECK(weight > 0)
+            )
+        ''')
+        
+        # Bring databases created by older versions up to date
+        _ensure_column(cursor, 'students', 'grade_version', 'INTEGER NOT NULL DEFAULT 0')
+        _ensure_column(cursor, 'students', 'average', 'REAL NOT NULL DEFAULT 0')
+        
+        # Keep students.average current: refresh one student on each grade
+        # write, and every student taking a subject when its weight changes.
+        # The triggers embed the average formula, so they are replaced when
+        # it changes and the stored averages recomputed with the new one
+        averages_changed = False
+        for event, row in [('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')]:
+            name = f'refresh_average_grades_{event.lower()}'
+            averages_changed |= _replace_trigger(cursor, name, f'''
+                AFTER {event} ON grades
+                BEGIN
+                    UPDATE students SET average = ({_WEIGHTED_AVERAGE_SQL})
+                    WHERE id = {row}.student_id;
+                END
+            ''')
+        
+        for action, event, row in [('insert', 'INSERT', 'NEW'),
+                                   ('update', 'UPDATE OF weight', 'NEW'),
+                                   ('delete', 'DELETE', 'OLD')]:
+            # Upserts that leave the weight unchanged refresh nothing
+            condition = 'WHEN OLD.weight IS NOT NEW.weight' if action == 'update' else ''
+            name = f'refresh_average_subject_weights_{action}'
+            averages_changed |= _replace_trigger(cursor, name, f'''
+                AFTER {event} ON subject_weights
+                {condition}
+                BEGIN
+                    UPDATE students
+                    SET average = ({_WEIGHTED_AVERAGE_SQL}),
+                        grade_version = grade_version + 1
+                    WHERE id IN (SELECT student_id FROM grades WHERE subject = {row}.subject);
+                END
+            ''')
+        
+        if averages_changed:
+            cursor.execute(f'UPDATE students SET average = ({_WEIGHTED_AVERAGE_SQL})')
+        
+        # Single-row counter bumped by triggers on every data change,
+        # used to key caches of derived results
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_version (
+                id INTEGER PRIMARY KEY CHECK(id = 1),
+                version INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)')
+        
+        for table, event in [('students', 'INSERT'), ('students', 'DELETE'),
+                             ('grades', 'INSERT'), ('grades', 'UPDATE'), ('grades', 'DELETE')]:
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS bump_data_version_{table}_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_version SET version = version + 1 WHERE id = 1;
+                END
+            ''')
         
         conn.commit()
 
 
+def _replace_trigger(cursor, name, definition):
+    """
+    Create a trigger, replacing an existing one with a different definition.
+    
+    Args:
+        cursor: Database cursor
+        name (str): Trigger name
+        definition (str): Trigger SQL following CREATE TRIGGER <name>
+        
+    Returns:
+        bool: True if the trigger was created or replaced
+    """
+    # SQLite keeps the CREATE statement as written, minus surrounding whitespace
+    sql = f'CREATE TRIGGER {name} {definition.strip()}'
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,))
+    row = cursor.fetchone()
+    if row is not None and row['sql'] == sql:
+        return False
+    
+    cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    cursor.execute(sql)
+    return True
+
+
+def _ensure_column(cursor, table, column, definition):
+    """
+    Add a column to an existing table if it is missing.
+    
+    Args:
+        cursor: Database cursor
+        table (str): Table name
+        column (str): Column name
+        definition (str): Column type and constraints
+        
+    Returns:
+        bool: True if the column was added
+    """
+    cursor.execute(f'PRAGMA table_info({table})')
+    if column in [row['name'] for row in cursor.fetchall()]:
+        return False
+    cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+    return True
+
+
 def add_student_to_db(name, roll_number):
     """
     Add a new student to the database.
@@ -100,7 +385,7 @@ def get_student_by_roll_number(roll_number):
     Returns:
         dict: Student data or None if not found
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             'SELECT * FROM students WHERE roll_number = ?',
@@ -120,7 +405,7 @@ def get_all_students():
     Returns:
         list: List of student dictionaries
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT * FROM students ORDER BY name')
         rows = cursor.fetchall()
@@ -156,6 +441,18 @@ def add_grade_to_db(student_id, subject, grade):
                 DO UPDATE SET grade = excluded.grade, created_at = CURRENT_TIMESTAMP
             ''', (student_id, subject, grade_float))
             
+            # Keep the full history alongside the current value
+            cursor.execute(
+                'INSERT INTO grade_events (student_id, subject, grade) VALUES (?, ?, ?)',
+                (student_id, subject, grade_float)
+            )
+            
+            # Bump the version stamp so cached views of this student are refreshed
+            cursor.execute(
+                'UPDATE students SET grade_version = grade_version + 1 WHERE id = ?',
+                (student_id,)
+            )
+            
             return True, "Grade added successfully"
     except ValueError:
         return False, "Invalid grade value"
@@ -173,7 +470,7 @@ def get_student_grades(student_id):
     Returns:
         list: List of grade dictionaries
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
             'SELECT subject, grade FROM grades WHERE student_id = ? ORDER BY subject',
@@ -193,28 +490,86 @@ def get_student_with_grades(roll_number):
     Returns:
         dict: Complete student data with grades or None if not found
     """
-    student = get_student_by_roll_number(roll_number)
-    
-    if not student:
-        return None
-    
-    grades = get_student_grades(student['id'])
+    with read_session():
+        student = get_student_by_roll_number(roll_number)
+        
+        if not student:
+            return None
+        
+        grades = get_student_grades(student['id'])
     
     # Convert grades list to dictionary
     grades_dict = {grade['subject']: grade['grade'] for grade in grades}
     
-    # Calculate average
-    average = sum(grades_dict.values()) / len(grades_dict) if grades_dict else 0
-    
     return {
         'id': student['id'],
         'name': student['name'],
         'roll_number': student['roll_number'],
         'grades': grades_dict,
-        'average': round(average, 2)
+        'average': student['average']  # Weighted, precomputed on grade writes
     }
 
 
+def get_students_with_grades_bulk(roll_numbers, chunk_size=500):
+    """
+    Get complete student information for many roll numbers at once.
+    
+    Roll numbers are resolved on a single connection with chunked
+    IN (...) queries, keeping each statement under SQLite's bound
+    parameter limit.
+    
+    Args:
+        roll_numbers (list): Roll numbers to look up
+        chunk_size (int): Maximum roll numbers per query
+        
+    Returns:
+        tuple: (found: dict mapping roll number to student data in the
+            get_student_with_grades format, missing: list of roll numbers
+            that do not exist, in input order)
+    """
+    # Drop duplicates but keep the caller's order
+    wanted = list(dict.fromkeys(roll_numbers))
+    found = {}
+    
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start:start + chunk_size]
+            placeholders = ', '.join('?' * len(chunk))
+            
+            cursor.execute(f'''
+                SELECT id, name, roll_number, average
+                FROM students
+                WHERE roll_number IN ({placeholders})
+            ''', chunk)
+            by_id = {}
+            for row in cursor.fetchall():
+                by_id[row['id']] = found[row['roll_number']] = {
+                    'id': row['id'],
+                    'name': row['name'],
+                    'roll_number': row['roll_number'],
+                    'grades': {},
+                    'average': row['average']
+                }
+            
+            if not by_id:
+                continue
+            
+            placeholders = ', '.join('?' * len(by_id))
+            cursor.execute(f'''
+                SELECT student_id, subject, grade
+                FROM grades
+                WHERE student_id IN ({placeholders})
+                ORDER BY subject
+            ''', list(by_id))
+            for row in cursor.fetchall():
+                by_id[row['student_id']]['grades'][row['subject']] = row['grade']
+    
+    missing = [roll_number for roll_number in wanted if roll_number not in found]
+    return found, missing
+
+
 def get_all_students_with_grades():
     """
     Get all students with their complete grade information.
@@ -222,23 +577,282 @@ def get_all_students_with_grades():
     Returns:
         list: List of student dictionaries with grades
     """
-    students = get_all_students()
-    result = []
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT id, name, roll_number, grade_version, average FROM students ORDER BY name'
+        )
+        students = cursor.fetchall()
+        
+        cursor.execute('SELECT student_id, subject, grade FROM grades ORDER BY subject')
+        grades_by_student = {}
+        for row in cursor.fetchall():
+            grades_by_student.setdefault(row['student_id'], {})[row['subject']] = row['grade']
     
+    return [{
+        'id': student['id'],
+        'name': student['name'],
+        'roll_number': student['roll_number'],
+        'grade_version': student['grade_version'],
+        'grades': grades_by_student.get(student['id'], {}),
+        'average': student['average']  # Weighted, precomputed on grade writes
+    } for student in students]
+
+
+def get_weighted_averages(student_id=None):
+    """
+    Compute credit-weighted averages directly from the grades table.
+    
+    Listings use the precomputed students.average column instead; this is
+    the single aggregate query that column is kept in sync with.
+    
+    Args:
+        student_id (int): Restrict to one student, or None for all students
+        
+    Returns:
+        dict: Student ID mapped to weighted average (students without
+            grades are omitted)
+    """
+    where = 'WHERE g.student_id = ?' if student_id is not None else ''
+    params = (student_id,) if student_id is not None else ()
+    
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT g.student_id, {_WEIGHTED_AVERAGE_EXPR} AS average
+            {_WEIGHTED_GRADES_FROM}
+            {where}
+            GROUP BY g.student_id
+        ''', params)
+        return {row['student_id']: row['average'] for row in cursor.fetchall()}
+
+
+def get_subject_weights():
+    """
+    Get the configured credit weight of every subject.
+    
+    Subjects without a configured weight count with weight 1.
+    
+    Returns:
+        dict: Subject name mapped to weight
+    """
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT subject, weight FROM subject_weights ORDER BY subject')
+        return {row['subject']: row['weight'] for row in cursor.fetchall()}
+
+
+def set_subject_weight(subject, weight):
+    """
+    Set the credit weight of a subject.
+    
+    Averages of every student taking the subject are refreshed in the
+    same transaction.
+    
+    Args:
+        subject (str): Subject name
+        weight (float): Credit weight (greater than 0)
+        
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    try:
+        weight_float = float(weight)
+        if not weight_float > 0:
+            return False, "Weight must be greater than 0"
+        
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO subject_weights (subject, weight)
+                VALUES (?, ?)
+                ON CONFLICT(subject) DO UPDATE SET weight = excluded.weight
+            ''', (subject, weight_float))
+            
+            return True, f"Weight for {subject} set to {weight_float:g}"
+    except ValueError:
+        return False, "Invalid weight value"
+    except Exception as e:
+        return False, f"Database error: {str(e)}"
+
+
+def get_report_card_data():
+    """
+    Get everything needed to build report cards for the whole roster.
+    
+    Uses two set-based queries on a single connection
+    instead of per-student lookups.
+    
+    Returns:
+        list: Student dictionaries, ordered by name, each with a 'grades'
+            mapping of subject to {'grade', 'rank', 'out_of', 'class_average'}
+            and the overall weighted 'average'
+    """
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT id, name, roll_number, average FROM students ORDER BY name')
+        students = [dict(row) for row in cursor.fetchall()]
+        
+        cursor.execute('''
+            SELECT student_id, subject, grade,
+                   RANK() OVER (PARTITION BY subject ORDER BY grade DESC) AS rank,
+                   COUNT(*) OVER (PARTITION BY subject) AS out_of,
+                   AVG(grade) OVER (PARTITION BY subject) AS class_average
+            FROM grades
+            ORDER BY student_id, subject
+        ''')
+        grade_rows = cursor.fetchall()
+    
+    by_student = {student['id']: student for student in students}
     for student in students:
-        grades = get_student_grades(student['id'])
-        grades_dict = {grade['subject']: grade['grade'] for grade in grades}
-        average = sum(grades_dict.values()) / len(grades_dict) if grades_dict else 0
-        
-        result.append({
-            'id': student['id'],
-            'name': student['name'],
-            'roll_number': student['roll_number'],
-            'grades': grades_dict,
-            'average': round(average, 2)
-        })
+        student['grades'] = {}
     
-    return result
+    for row in grade_rows:
+        student = by_student.get(row['student_id'])
+        if student is None:
+            continue
+        student['grades'][row['subject']] = {
+            'grade': row['grade'],
+            'rank': row['rank'],
+            'out_of': row['out_of'],
+            'class_average': round(row['class_average'], 2)
+        }
+    
+    return students
+
+
+def get_student_trend(student_id, subject=None, since=None, until=None):
+    """
+    Get a student's grade trajectory from the grade history.
+    
+    Compacted history is returned as one point per subject and month
+    holding the month's average, and is included when its month overlaps
+    the requested range.
+    
+    Args:
+        student_id (int): Student's database ID
+        subject (str): Restrict to one subject, or None for all subjects
+        since (str): Earliest date to include ('YYYY-MM-DD'), or None
+        until (str): Date to stop before ('YYYY-MM-DD'), or None
+        
+    Returns:
+        list: Chronological dictionaries with 'subject', 'date', 'grade'
+            and 'count' (number of grades behind the point)
+    """
+    # Only add the filters that are given, so subject becomes an equality and
+    # the dates a range on the (student_id, subject, created_at) index
+    event_filters, event_params = ['student_id = ?'], [student_id]
+    summary_filters, summary_params = ['student_id = ?'], [student_id]
+    if subject is not None:
+        event_filters.append('subject = ?')
+        event_params.append(subject)
+        summary_filters.append('subject = ?')
+        summary_params.append(subject)
+    # A compacted month overlaps the range when it ends on or after since
+    # and starts before until
+    if since is not None:
+        event_filters.append('created_at >= ?')
+        event_params.append(since)
+        summary_filters.append('period >= ?')
+        summary_params.append(since[:7])
+    if until is not None:
+        event_filters.append('created_at < ?')
+        event_params.append(until)
+        summary_filters.append("period || '-01' < ?")
+        summary_params.append(until)
+    
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT subject, period || '-01' AS date,
+                   ROUND(grade_sum / event_count, 2) AS grade, event_count AS count
+            FROM grade_event_summaries
+            WHERE {' AND '.join(summary_filters)}
+            UNION ALL
+            SELECT subject, created_at AS date, grade, 1 AS count
+            FROM grade_events
+            WHERE {' AND '.join(event_filters)}
+            ORDER BY date, subject
+        ''', summary_params + event_params)
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def get_subject_monthly_averages(subject, since=None, until=None):
+    """
+    Get a subject's average grade per month from the grade history.
+    
+    Compacted months are included when they overlap the requested range.
+    
+    Args:
+        subject (str): Subject name
+        since (str): Earliest date to include ('YYYY-MM-DD'), or None
+        until (str): Date to stop before ('YYYY-MM-DD'), or None
+        
+    Returns:
+        list: Dictionaries with 'month' ('YYYY-MM'), 'average' and 'count',
+            ordered by month
+    """
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT month, ROUND(SUM(total) / SUM(n), 2) AS average, SUM(n) AS count
+            FROM (
+                SELECT strftime('%Y-%m', created_at) AS month, SUM(grade) AS total, COUNT(*) AS n
+                FROM grade_events
+                WHERE subject = ?
+                  AND created_at >= COALESCE(?, '')
+                  AND created_at < COALESCE(?, '9999-12-31')
+                GROUP BY month
+                UNION ALL
+                SELECT period, SUM(grade_sum), SUM(event_count)
+                FROM grade_event_summaries
+                WHERE subject = ?
+                  AND period >= substr(COALESCE(?, '0000-00'), 1, 7)
+                  AND period || '-01' < COALESCE(?, '9999-12-31')
+                GROUP BY period
+            )
+            GROUP BY month
+            ORDER BY month
+        ''', (subject, since, until, subject, since, until))
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def compact_grade_events(before):
+    """
+    Roll grade events older than a date into monthly summaries.
+    
+    The summarized events are deleted, bounding the size of the history
+    table while keeping monthly trends available.
+    
+    Args:
+        before (str): Compact events created before this date ('YYYY-MM-DD')
+        
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO grade_event_summaries
+                    (student_id, subject, period, event_count, grade_sum, min_grade, max_grade)
+                SELECT student_id, subject, strftime('%Y-%m', created_at),
+                       COUNT(*), SUM(grade), MIN(grade), MAX(grade)
+                FROM grade_events
+                WHERE created_at < ?
+                GROUP BY student_id, subject, strftime('%Y-%m', created_at)
+                ON CONFLICT(student_id, subject, period) DO UPDATE SET
+                    event_count = event_count + excluded.event_count,
+                    grade_sum = grade_sum + excluded.grade_sum,
+                    min_grade = MIN(min_grade, excluded.min_grade),
+                    max_grade = MAX(max_grade, excluded.max_grade)
+            ''', (before,))
+            
+            cursor.execute('DELETE FROM grade_events WHERE created_at < ?', (before,))
+            
+            return True, f"Compacted {cursor.rowcount} grade events created before {before}"
+    except Exception as e:
+        return False, f"Database error: {str(e)}"
 
 
 def get_subject_topper(subject):
@@ -251,7 +865,7 @@ def get_subject_topper(subject):
     Returns:
         dict: Topper information or None if no data
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
             SELECT s.name, s.roll_number, g.grade
@@ -279,7 +893,7 @@ def get_class_average(subject):
     Returns:
         float: Class average or None if no data
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('''
             SELECT AVG(grade) as average
@@ -294,6 +908,127 @@ def get_class_average(subject):
         return None
 
 
+def get_data_version():
+    """
+    Get the current data version stamp.
+    
+    The stamp changes whenever a student or grade is added, changed or
+    removed, so it can be used as part of a cache key.
+    
+    Returns:
+        int: Current data version
+    """
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT version FROM data_version WHERE id = 1')
+        row = cursor.fetchone()
+        return row['version'] if row else 0
+
+
+def _fetch_distributions(cursor, bucket_width, subject=None):
+    """
+    Compute grade statistics and histograms per subject in SQL.
+    
+    Args:
+        cursor: Database cursor
+        bucket_width (int): Width of each histogram bucket
+        subject (str): Restrict to one subject, or None for all subjects
+        
+    Returns:
+        dict: Subject name mapped to its distribution dictionary
+    """
+    # Whole-number widths keep bucket boundaries exact, so SQL and the
+    # labels built here agree on which bucket a grade belongs to
+    if not isinstance(bucket_width, int) or not (0 < bucket_width <= 100):
+        raise ValueError("Bucket width must be a whole number from 1 to 100")
+    
+    where = 'WHERE subject = ?' if subject is not None else ''
+    params = (subject,) if subject is not None else ()
+    last_bucket = math.ceil(100 / bucket_width) - 1
+    
+    # Count, mean and interpolated quartiles (min and max as the 0th and
+    # 100th percentiles) from one pass of window functions
+    cursor.execute(f'''
+        WITH ranked AS (
+            SELECT subject, grade,
+                   LEAD(grade) OVER (PARTITION BY subject ORDER BY grade) AS next_grade,
+                   ROW_NUMBER() OVER (PARTITION BY subject ORDER BY grade) - 1 AS pos,
+                   COUNT(*) OVER (PARTITION BY subject) AS n,
+                   AVG(grade) OVER (PARTITION BY subject) AS mean
+            FROM grades
+            {where}
+        ),
+        percentiles(name, p) AS (
+            VALUES ('min', 0.0), ('q1', 0.25), ('median', 0.5), ('q3', 0.75), ('max', 1.0)
+        )
+        SELECT r.subject, r.n, r.mean, q.name,
+               r.grade + (COALESCE(r.next_grade, r.grade) - r.grade)
+                         * (q.p * (r.n - 1) - r.pos) AS value
+        FROM ranked r
+        JOIN percentiles q ON r.pos = CAST(q.p * (r.n - 1) AS INTEGER)
+        ORDER BY r.subject
+    ''', params)
+    
+    distributions = {}
+    for row in cursor.fetchall():
+        entry = distributions.setdefault(row['subject'], {
+            'subject': row['subject'],
+            'count': row['n'],
+            'mean': round(row['mean'], 2),
+            'buckets': [
+                {'start': b * bucket_width, 'end': min((b + 1) * bucket_width, 100), 'count': 0}
+                for b in range(last_bucket + 1)
+            ]
+        })
+        entry[row['name']] = round(row['value'], 2)
+    
+    # Histogram from a single bucketed GROUP BY; 100 falls in the last bucket
+    cursor.execute(f'''
+        SELECT subject, MIN(CAST(grade / ? AS INTEGER), ?) AS bucket, COUNT(*) AS count
+        FROM grades
+        {where}
+        GROUP BY subject, bucket
+    ''', (bucket_width, last_bucket) + params)
+    
+    for row in cursor.fetchall():
+        distributions[row['subject']]['buckets'][row['bucket']]['count'] = row['count']
+    
+    return distributions
+
+
+def get_subject_distribution(subject, bucket_width=10):
+    """
+    Get the grade distribution for a specific subject.
+    
+    Args:
+        subject (str): Subject name
+        bucket_width (int): Width of each histogram bucket (1-100)
+        
+    Returns:
+        dict: count, mean, min, q1, median, q3, max and a list of
+            histogram buckets ({'start', 'end', 'count'}), or None if no data
+    """
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        return _fetch_distributions(cursor, bucket_width, subject).get(subject)
+
+
+def get_subject_summary(bucket_width=10):
+    """
+    Get the grade distribution for every subject.
+    
+    Args:
+        bucket_width (int): Width of each histogram bucket (1-100)
+        
+    Returns:
+        list: Distribution dictionaries (see get_subject_distribution),
+            ordered by subject
+    """
+    with get_read_connection() as conn:
+        cursor = conn.cursor()
+        return list(_fetch_distributions(cursor, bucket_width).values())
+
+
 def get_all_subjects():
     """
     Get a list of all unique subjects in the database.
@@ -301,7 +1036,7 @@ def get_all_subjects():
     Returns:
         list: List of subject names
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor = conn.cursor()
         cursor.execute('SELECT DISTINCT subject FROM grades ORDER BY subject')
         rows = cursor.fetchall()
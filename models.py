@@ -3,6 +3,15 @@ Student Performance Tracker - Core Models
 This module contains the Student and StudentTracker classes for managing student data.
 """
 
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+
 class Student:
     """Represents a student with their grades across different subjects."""
     
@@ -51,22 +60,34 @@ class Student:
         except (ValueError, TypeError):
             return False
     
-    def calculate_average(self):
+    def calculate_average(self, weights=None):
         """
         Calculate the average grade across all subjects.
         
+        Args:
+            weights (dict): Optional subject: credit weight pairs; subjects
+                without a weight count with weight 1
+        
         Returns:
-            float: Average grade, or 0 if no grades exist
+            float: (Weighted) average grade, or 0 if no grades exist
         """
         if not self.grades:
             return 0
         
-        return sum(self.grades.values()) / len(self.grades)
+        if not weights:
+            return sum(self.grades.values()) / len(self.grades)
+        
+        total_weight = sum(weights.get(subject, 1) for subject in self.grades)
+        weighted_sum = sum(grade * weights.get(subject, 1) for subject, grade in self.grades.items())
+        return weighted_sum / total_weight
     
-    def get_details(self):
+    def get_details(self, weights=None):
         """
         Get formatted student details.
         
+        Args:
+            weights (dict): Optional subject: credit weight pairs used for the average
+        
         Returns:
             dict: Dictionary containing student information
         """
@@ -74,7 +95,7 @@ class Student:
             'name': self.name,
             'roll_number': self.roll_number,
             'grades': self.grades,
-            'average': round(self.calculate_average(), 2)
+            'average': round(self.calculate_average(weights), 2)
         }
     
     def __str__(self):
@@ -89,6 +110,29 @@ class StudentTracker:
     def __init__(self):
         """Initialize the StudentTracker with an empty student dictionary."""
         self.students = {}  # Dictionary with roll_number as key
+        self.subject_weights = {}  # Dictionary with subject as key, credit weight as value
+    
+    def set_subject_weight(self, subject, weight):
+        """
+        Set the credit weight used for a subject in student averages.
+        
+        Args:
+            subject (str): Subject name
+            weight (float): Credit weight (greater than 0)
+            
+        Returns:
+            tuple: (success: bool, message: str)
+        """
+        try:
+            weight_float = float(weight)
+        except (ValueError, TypeError):
+            return False, "Invalid weight value"
+        
+        if not weight_float > 0:
+            return False, "Weight must be greater than 0"
+        
+        self.subject_weights[subject] = weight_float
+        return True, f"Weight for {subject} set to {weight_float:g}"
     
     def add_student(self, name, roll_number):
         """
@@ -170,7 +214,7 @@ class StudentTracker:
         if not student:
             return None
         
-        return student.get_details()
+        return student.get_details(self.subject_weights)
     
     def calculate_average(self, roll_number):
         """
@@ -187,7 +231,7 @@ class StudentTracker:
         if not student:
             return None
         
-        return student.calculate_average()
+        return student.calculate_average(self.subject_weights)
     
     def get_all_students(self):
         """
@@ -196,7 +240,7 @@ class StudentTracker:
         Returns:
             list: List of student details dictionaries
         """
-        return [student.get_details() for student in self.students.values()]
+        return [student.get_details(self.subject_weights) for student in self.students.values()]
     
     def get_subject_topper(self, subject):
         """
@@ -257,3 +301,287 @@ class StudentTracker:
         for student in self.students.values():
             subjects.update(student.grades.keys())
         return sorted(list(subjects))
+    
+    def save(self, path):
+        """
+        Save the tracker to a compact columnar binary snapshot.
+        
+        The file holds a subject dictionary, a roll number table and packed
+        grade arrays (see _write_snapshot). Grades are stored as floats.
+        
+        Args:
+            path (str): Destination file path
+        """
+        _write_snapshot(path, self.students, self.subject_weights)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Open a tracker from a binary snapshot written by save().
+        
+        The file is memory-mapped and Student objects are only created when
+        they are accessed, so opening is fast regardless of size and the
+        pages are shared between processes that load the same file.
+        
+        Args:
+            path (str): Snapshot file path
+            
+        Returns:
+            StudentTracker: Tracker backed by the snapshot
+        """
+        snapshot = _Snapshot(path)
+        tracker = cls()
+        tracker.students = _MappedStudents(snapshot)
+        tracker.subject_weights = snapshot.subject_weights()
+        return tracker
+
+
+# Binary snapshot format (little-endian), each section 8-byte aligned:
+#   header: magic, version, subject/student/grade counts, section offsets
+#   subject dictionary: uint32 offsets into a UTF-8 blob, float64 weights (NaN = unset)
+#   roll number table: uint64 offsets into UTF-8 blobs for roll numbers and names,
+#       plus uint32 student indexes sorted by roll number for binary search
+#   grades: uint64 per-student offsets into packed uint32 subject ids and float64 values
+_MAGIC = b'SPTB'
+_VERSION = 1
+_SECTIONS = ('subject_offsets', 'subject_blob', 'subject_weights',
+             'name_offsets', 'name_blob', 'roll_offsets', 'roll_blob', 'roll_order',
+             'grade_offsets', 'grade_subjects', 'grade_values')
+_HEADER = struct.Struct('<4sHHQQQ' + 'Q' * len(_SECTIONS))
+
+
+def _pack(typecode, values):
+    """Pack values into little-endian bytes."""
+    packed = array(typecode, values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _pack_strings(strings):
+    """Encode strings into (offsets list, concatenated UTF-8 blob)."""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    return offsets, b''.join(encoded)
+
+
+def _write_snapshot(path, students, subject_weights):
+    """
+    Write students and subject weights to a binary snapshot file.
+    
+    Args:
+        path (str): Destination file path
+        students (Mapping): roll_number: Student pairs
+        subject_weights (dict): subject: weight pairs
+    """
+    rolls, names = [], []
+    grade_offsets, grade_subjects, grade_values = [0], [], []
+    subject_ids = {}
+    
+    for roll_number, student in students.items():
+        rolls.append(roll_number)
+        names.append(student.name)
+        for subject, grade in student.grades.items():
+            grade_subjects.append(subject_ids.setdefault(subject, len(subject_ids)))
+            grade_values.append(float(grade))
+        grade_offsets.append(len(grade_values))
+    
+    for subject in subject_weights:
+        subject_ids.setdefault(subject, len(subject_ids))
+    subjects = list(subject_ids)
+    
+    subject_offsets, subject_blob = _pack_strings(subjects)
+    name_offsets, name_blob = _pack_strings(names)
+    roll_offsets, roll_blob = _pack_strings(rolls)
+    encoded_rolls = [roll_blob[roll_offsets[i]:roll_offsets[i + 1]] for i in range(len(rolls))]
+    roll_order = sorted(range(len(rolls)), key=encoded_rolls.__getitem__)
+    
+    sections = {
+        'subject_offsets': _pack('I', subject_offsets),
+        'subject_blob': subject_blob,
+        'subject_weights': _pack('d', [subject_weights.get(s, math.nan) for s in subjects]),
+        'name_offsets': _pack('Q', name_offsets),
+        'name_blob': name_blob,
+        'roll_offsets': _pack('Q', roll_offsets),
+        'roll_blob': roll_blob,
+        'roll_order': _pack('I', roll_order),
+        'grade_offsets': _pack('Q', grade_offsets),
+        'grade_subjects': _pack('I', grade_subjects),
+        'grade_values': _pack('d', grade_values),
+    }
+    
+    offsets = []
+    position = _HEADER.size
+    for name in _SECTIONS:
+        position += -position % 8
+        offsets.append(position)
+        position += len(sections[name])
+    
+    # Write to a temporary file first so readers never see a partial snapshot
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(subjects), len(rolls), len(grade_values), *offsets))
+        for name, offset in zip(_SECTIONS, offsets):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(sections[name])
+    os.replace(temp_path, path)
+
+
+class _Snapshot:
+    """Read-only, memory-mapped view of a binary snapshot file."""
+    
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if len(self._mmap) < _HEADER.size:
+            raise ValueError(f"{path} is not a student tracker snapshot")
+        magic, version, _, n_subjects, n_students, n_grades, *offsets = \
+            _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a student tracker snapshot")
+        
+        self.count = n_students
+        self._offsets = dict(zip(_SECTIONS, offsets))
+        self._subject_offsets = self._array('subject_offsets', 'I', n_subjects + 1)
+        self._subject_weights = self._array('subject_weights', 'd', n_subjects)
+        self._name_offsets = self._array('name_offsets', 'Q', n_students + 1)
+        self._roll_offsets = self._array('roll_offsets', 'Q', n_students + 1)
+        self._roll_order = self._array('roll_order', 'I', n_students)
+        self._grade_offsets = self._array('grade_offsets', 'Q', n_students + 1)
+        self._grade_subjects = self._array('grade_subjects', 'I', n_grades)
+        self._grade_values = self._array('grade_values', 'd', n_grades)
+        self.subjects = [self._string('subject_blob', self._subject_offsets, i)
+                         for i in range(n_subjects)]
+    
+    def _array(self, section, typecode, count):
+        """View a section as an array of numbers without copying it."""
+        start = self._offsets[section]
+        view = memoryview(self._mmap)[start:start + count * struct.calcsize(typecode)]
+        if sys.byteorder == 'little':
+            return view.cast(typecode)
+        values = array(typecode, view)
+        values.byteswap()
+        return values
+    
+    def _bytes(self, blob, offsets, index):
+        """Raw bytes of the index-th string in a blob."""
+        start = self._offsets[blob]
+        return self._mmap[start + offsets[index]:start + offsets[index + 1]]
+    
+    def _string(self, blob, offsets, index):
+        """Decode the index-th string in a blob."""
+        return self._bytes(blob, offsets, index).decode('utf-8')
+    
+    def roll_number(self, index):
+        """Roll number of the index-th student."""
+        return self._string('roll_blob', self._roll_offsets, index)
+    
+    def find(self, roll_number):
+        """Index of the student with the given roll number, or None."""
+        target = roll_number.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._bytes('roll_blob', self._roll_offsets, self._roll_order[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            index = self._roll_order[low]
+            if self._bytes('roll_blob', self._roll_offsets, index) == target:
+                return index
+        return None
+    
+    def student(self, index):
+        """Materialize the index-th student as a Student object."""
+        student = Student(self._string('name_blob', self._name_offsets, index),
+                          self.roll_number(index).strip())
+        for position in range(self._grade_offsets[index], self._grade_offsets[index + 1]):
+            subject = self.subjects[self._grade_subjects[position]]
+            student.grades[subject] = self._grade_values[position]
+        return student
+    
+    def subject_weights(self):
+        """Configured subject weights as a dictionary."""
+        return {subject: weight for subject, weight in zip(self.subjects, self._subject_weights)
+                if not math.isnan(weight)}
+
+
+class _MappedStudents(MutableMapping):
+    """
+    roll_number: Student mapping backed by a snapshot.
+    
+    Students looked up by roll number are materialized from the snapshot
+    and kept, so changes to them persist; added and removed students are
+    tracked on top of the snapshot. Iterating values() or items() builds
+    the remaining students on the fly without keeping them, so scans do not
+    copy the snapshot into memory; change students through lookups only.
+    """
+    
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+        self._loaded = {}
+        self._added = set()
+        self._deleted = set()
+    
+    def __getitem__(self, roll_number):
+        if roll_number in self._loaded:
+            return self._loaded[roll_number]
+        if roll_number in self._deleted:
+            raise KeyError(roll_number)
+        index = self._snapshot.find(roll_number)
+        if index is None:
+            raise KeyError(roll_number)
+        student = self._loaded[roll_number] = self._snapshot.student(index)
+        return student
+    
+    def __contains__(self, roll_number):
+        if roll_number in self._loaded:
+            return True
+        if roll_number in self._deleted:
+            return False
+        return self._snapshot.find(roll_number) is not None
+    
+    def __setitem__(self, roll_number, student):
+        if roll_number not in self:
+            if roll_number in self._deleted:
+                self._deleted.discard(roll_number)
+            else:
+                self._added.add(roll_number)
+        self._loaded[roll_number] = student
+    
+    def __delitem__(self, roll_number):
+        if roll_number not in self:
+            raise KeyError(roll_number)
+        self._loaded.pop(roll_number, None)
+        if roll_number in self._added:
+            self._added.discard(roll_number)
+        else:
+            self._deleted.add(roll_number)
+    
+    def __iter__(self):
+        for index in range(self._snapshot.count):
+            roll_number = self._snapshot.roll_number(index)
+            if roll_number not in self._deleted:
+                yield roll_number
+        yield from [roll_number for roll_number in self._loaded if roll_number in self._added]
+    
+    def __len__(self):
+        return self._snapshot.count - len(self._deleted) + len(self._added)
+    
+    def items(self):
+        for index in range(self._snapshot.count):
+            roll_number = self._snapshot.roll_number(index)
+            if roll_number in self._loaded:
+                yield roll_number, self._loaded[roll_number]
+            elif roll_number not in self._deleted:
+                yield roll_number, self._snapshot.student(index)
+        yield from [(roll_number, self._loaded[roll_number])
+                    for roll_number in self._loaded if roll_number in self._added]
+    
+    def values(self):
+        for _, student in self.items():
+            yield student
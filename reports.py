@@ -0,0 +1,261 @@
+"""
+Student Performance Tracker - Report Cards
+This module renders per-student report cards for the whole roster in parallel
+and packages them into a ZIP archive that can be streamed or written to disk.
+
+Usage:
+    python reports.py [--output report_cards.zip] [--workers N]
+"""
+
+import argparse
+import math
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from werkzeug.utils import secure_filename
+
+import database as db
+
+
+def render_report_card(student):
+    """
+    Render a single student's report card as text.
+
+    Args:
+        student (dict): Student data from database.get_report_card_data
+
+    Returns:
+        tuple: (filename: str, content: str)
+    """
+    lines = [
+        "=" * 60,
+        "REPORT CARD",
+        "=" * 60,
+        f"Name: {student['name']}",
+        f"Roll Number: {student['roll_number']}",
+        f"Average Grade: {student['average']}",
+        "-" * 60,
+    ]
+
+    if student['grades']:
+        lines.append(f"{'Subject':<20}{'Grade':>8}{'Rank':>12}{'Class Avg':>12}")
+        for subject, entry in sorted(student['grades'].items()):
+            rank = f"{entry['rank']}/{entry['out_of']}"
+            lines.append(f"{subject:<20}{entry['grade']:>8}{rank:>12}{entry['class_average']:>12}")
+    else:
+        lines.append("No grades recorded.")
+
+    lines.append("=" * 60)
+
+    filename = f"{secure_filename(student['roll_number']) or 'student'}_{student['id']}.txt"
+    return filename, "\n".join(lines) + "\n"
+
+
+def compress_report_batch(students):
+    """
+    Render and deflate the report cards for a batch of students.
+
+    This is the unit of work sent to each worker process, so both the
+    rendering and the compression run in parallel and only compressed
+    bytes are sent back.
+
+    Args:
+        students (list): Student data from database.get_report_card_data
+
+    Returns:
+        list: (filename, crc32, uncompressed size, deflated bytes) per student
+    """
+    entries = []
+    for student in students:
+        filename, content = render_report_card(student)
+        data = content.encode('utf-8')
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+        entries.append((filename, zlib.crc32(data), len(data), compressed))
+    return entries
+
+
+def generate_report_batches(students, workers=None, progress=None, batch_size=None):
+    """
+    Render and compress report cards in batches, using a process pool
+    when more than one worker is requested.
+
+    Args:
+        students (list): Student data from database.get_report_card_data
+        workers (int): Number of worker processes; defaults to the CPU count.
+            With one worker, batches are processed in the current process.
+        progress (callable): Optional progress(done, total) callback
+        batch_size (int): Students per batch; by default sized so each
+            worker gets several batches
+
+    Yields:
+        list: Compressed entries (see compress_report_batch), in input order
+    """
+    total = len(students)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = max(1, min(1000, math.ceil(total / (workers * 4))))
+
+    batches = [students[i:i + batch_size] for i in range(0, total, batch_size)]
+
+    executor = None
+    if workers > 1 and len(batches) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(compress_report_batch, batches)
+    else:
+        results = map(compress_report_batch, batches)
+
+    try:
+        done = 0
+        for entries in results:
+            done += len(entries)
+            if progress:
+                progress(done, total)
+            yield entries
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+
+class _ZipStreamWriter:
+    """
+    Minimal streaming ZIP writer for entries that are already deflated.
+
+    zipfile can only compress entries itself, which would keep deflate in
+    the parent process; this writes the same format from precompressed
+    data, switching to ZIP64 records when counts or offsets need it.
+    """
+
+    _LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+    _CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+    _END_RECORD = struct.Struct('<IHHHHIIH')
+    _ZIP64_END_RECORD = struct.Struct('<IQHHIIQQQQ')
+    _ZIP64_LOCATOR = struct.Struct('<IIQI')
+    _UTF8_FLAG = 0x800
+    _MAX_32 = 0xFFFFFFFF
+    _MAX_16 = 0xFFFF
+
+    def __init__(self):
+        self._offset = 0
+        self._central = []
+        now = datetime.now()
+        self._dos_time = (now.hour << 11) | (now.minute << 5) | (now.second // 2)
+        self._dos_date = ((now.year - 1980) << 9) | (now.month << 5) | now.day
+
+    def add(self, filename, crc, size, compressed):
+        """
+        Add one deflated entry.
+
+        Returns:
+            bytes: Local header and data to write out
+        """
+        name = filename.encode('utf-8')
+        header = self._LOCAL_HEADER.pack(
+            0x04034b50, 20, self._UTF8_FLAG, zipfile.ZIP_DEFLATED,
+            self._dos_time, self._dos_date, crc, len(compressed), size, len(name), 0
+        )
+        self._central.append((name, crc, len(compressed), size, self._offset))
+        self._offset += len(header) + len(name) + len(compressed)
+        return header + name + compressed
+
+    def finish(self):
+        """
+        Build the central directory and end records.
+
+        Returns:
+            bytes: Trailing bytes of the archive
+        """
+        parts = []
+        for name, crc, compressed_size, size, offset in self._central:
+            extra = b''
+            if offset >= self._MAX_32:
+                extra = struct.pack('<HHQ', 0x0001, 8, offset)
+                offset = self._MAX_32
+            version = 45 if extra else 20
+            parts.append(self._CENTRAL_HEADER.pack(
+                0x02014b50, version, version, self._UTF8_FLAG, zipfile.ZIP_DEFLATED,
+                self._dos_time, self._dos_date, crc, compressed_size, size,
+                len(name), len(extra), 0, 0, 0, 0, offset
+            ) + name + extra)
+
+        directory = b''.join(parts)
+        count = len(self._central)
+        start = self._offset
+        trailer = b''
+        if count >= self._MAX_16 or start >= self._MAX_32 or len(directory) >= self._MAX_32:
+            zip64_offset = start + len(directory)
+            trailer += self._ZIP64_END_RECORD.pack(
+                0x06064b50, self._ZIP64_END_RECORD.size - 12, 45, 45, 0, 0,
+                count, count, len(directory), start
+            )
+            trailer += self._ZIP64_LOCATOR.pack(0x07064b50, 0, zip64_offset, 1)
+            # Readers take the real values from the ZIP64 record
+            count, size, start = 0xFFFF, 0xFFFFFFFF, 0xFFFFFFFF
+        else:
+            size = len(directory)
+        trailer += self._END_RECORD.pack(0x06054b50, 0, 0, count, count, size, start, 0)
+        return directory + trailer
+
+
+def iter_report_zip(students, workers=None, progress=None):
+    """
+    Stream a ZIP archive containing one report card per student.
+
+    Args:
+        students (list): Student data from database.get_report_card_data
+        workers (int): Number of worker processes (see generate_report_batches)
+        progress (callable): Optional progress(done, total) callback
+
+    Yields:
+        bytes: Consecutive chunks of the ZIP file, one per batch
+    """
+    writer = _ZipStreamWriter()
+    for entries in generate_report_batches(students, workers, progress):
+        yield b''.join(writer.add(*entry) for entry in entries)
+    yield writer.finish()
+
+
+def write_report_zip(path, workers=None, progress=None):
+    """
+    Generate report cards for the whole roster into a ZIP file on disk.
+
+    Args:
+        path (str): Destination file path
+        workers (int): Number of worker processes (see generate_report_batches)
+        progress (callable): Optional progress(done, total) callback
+
+    Returns:
+        int: Number of report cards written
+    """
+    students = db.get_report_card_data()
+    with open(path, 'wb') as f:
+        for chunk in iter_report_zip(students, workers, progress):
+            f.write(chunk)
+    return len(students)
+
+
+def _print_progress(done, total):
+    """Print a single-line progress indicator to stderr."""
+    if done == total or done % 100 == 0:
+        end = "\n" if done == total else ""
+        print(f"\rGenerated {done}/{total} report cards", end=end, file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate report cards for every student.")
+    parser.add_argument('--output', default=f"report_cards_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    count = write_report_zip(args.output, args.workers, _print_progress)
+    print(f"Wrote {count} report cards to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Student Performance Tracker - Grade History Tests
+Trend queries must give the same answer before and after old grade events
+are compacted into monthly summaries.
+
+Usage:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+# Point the app at a throwaway directory before it is imported
+os.environ['DATABASE_DIR'] = tempfile.mkdtemp(prefix='spt_test_')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database as db  # noqa: E402
+
+# Two grades a month from August to November 2026
+EVENTS = [
+    ('Math', 60, '2026-08-03'), ('Math', 70, '2026-08-20'),
+    ('Math', 80, '2026-09-05'), ('Math', 90, '2026-09-30 23:59:59'),
+    ('Math', 50, '2026-10-01'), ('Math', 64, '2026-10-15'),
+    ('Math', 72, '2026-11-02'), ('Math', 88, '2026-11-28'),
+]
+
+# Ranges whose bounds fall on month boundaries, where a compacted month
+# is either entirely inside or entirely outside the range
+RANGES = [
+    (None, None), ('2026-09-01', None), (None, '2026-10-01'),
+    ('2026-09-01', '2026-11-01'), ('2026-10-01', '2026-10-01'), (None, '2026-08-01'),
+]
+
+
+class CompactionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.original_name = db.DATABASE_NAME
+        db.DATABASE_NAME = os.path.join(self.directory.name, 'student_tracker.db')
+        db.init_database()
+        
+        _, _, self.student_id = db.add_student_to_db('Test Student', 'T001')
+        with db.get_db_connection() as conn:
+            conn.execute('DELETE FROM grade_events')
+            conn.executemany(
+                'INSERT INTO grade_events (student_id, subject, grade, created_at) VALUES (?, ?, ?, ?)',
+                [(self.student_id, subject, grade, created_at) for subject, grade, created_at in EVENTS]
+            )
+
+    def tearDown(self):
+        db.DATABASE_NAME = self.original_name
+        self.directory.cleanup()
+
+    def monthly_trend(self, since, until):
+        """The student's trend, reduced to (month, average, count) per month."""
+        months = {}
+        for point in db.get_student_trend(self.student_id, 'Math', since, until):
+            total, count = months.get(point['date'][:7], (0, 0))
+            months[point['date'][:7]] = (total + point['grade'] * point['count'], count + point['count'])
+        return [(month, round(total / count, 2), count) for month, (total, count) in sorted(months.items())]
+
+    def test_queries_unchanged_by_compaction(self):
+        before = {bounds: (self.monthly_trend(*bounds), db.get_subject_monthly_averages('Math', *bounds))
+                  for bounds in RANGES}
+        
+        success, message = db.compact_grade_events('2026-11-01')
+        self.assertTrue(success, message)
+        
+        for bounds in RANGES:
+            with self.subTest(since=bounds[0], until=bounds[1]):
+                after = (self.monthly_trend(*bounds), db.get_subject_monthly_averages('Math', *bounds))
+                self.assertEqual(after, before[bounds])
+
+    def test_month_starting_on_until_excluded(self):
+        db.compact_grade_events('2026-11-01')
+        
+        self.assertEqual(db.get_student_trend(self.student_id, until='2026-08-01'), [])
+        months = [row['month'] for row in db.get_subject_monthly_averages('Math', until='2026-10-01')]
+        self.assertEqual(months, ['2026-08', '2026-09'])
+
+
+if __name__ == '__main__':
+    unittest.main()